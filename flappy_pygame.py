@@ -2,12 +2,16 @@ import pygame
 import sys
 import random
 import os
+from collections import deque
 
 # -------------------------
 # Configuration / Constants
 # -------------------------
 WIDTH, HEIGHT = 400, 640
 FPS = 60
+PHYSICS_STEP = 1.0 / 60  # seconds of game time per physics update
+MAX_PHYSICS_STEPS = 5  # cap on catch-up updates after a slow frame
+PHYSICS_SNAP = 0.002  # frame times this close to PHYSICS_STEP count as exactly one step
 
 BIRD_X = 80
 BIRD_WIDTH, BIRD_HEIGHT = 34, 24  # visual size (rectangle)
@@ -29,6 +33,11 @@ COIN_BONUS = 5  # points per coin
 # Particle effect for coins
 PARTICLE_LIFETIME = 30  # frames
 
+# Dedicated RNG for pipe and coin spawns, with its methods pre-bound
+_rng = random.Random()
+_random = _rng.random
+_randint = _rng.randint
+
 # -------------------------
 # Helper functions
 # -------------------------
@@ -48,14 +57,16 @@ def save_highscore(score):
     except Exception:
         pass
 
-def load_image(path, fallback_color, size=None):
+def load_image(path, fallback_color, size=None, alpha=True):
+    # Images are converted to the display format so blits skip per-pixel conversion
     try:
-        img = pygame.image.load(path).convert_alpha()
+        img = pygame.image.load(path)
+        img = img.convert_alpha() if alpha else img.convert()
         if size:
             img = pygame.transform.scale(img, size)
         return img
     except:
-        surf = pygame.Surface(size or (BIRD_WIDTH, BIRD_HEIGHT))
+        surf = pygame.Surface(size or (BIRD_WIDTH, BIRD_HEIGHT)).convert()
         surf.fill(fallback_color)
         return surf
 
@@ -65,10 +76,37 @@ def load_sound(path):
     except:
         return None  # Silent fallback
 
+def build_sprites():
+    # Rasterize static sprites once so the frame loop only blits
+    global BIRD_IMAGES, PIPE_SURF, COIN_SURF, PARTICLE_SURFS
+
+    # Bird rotation is clamped to -25..90 degrees; pre-rotate every whole degree
+    bird_image = load_image('bird.png', (255, 210, 0), (BIRD_WIDTH, BIRD_HEIGHT))  # Yellow fallback
+    BIRD_IMAGES = [pygame.transform.rotate(bird_image, angle) for angle in range(-25, 91)]
+
+    PIPE_SURF = pygame.Surface((PIPE_WIDTH, HEIGHT)).convert()
+    PIPE_SURF.fill((34, 139, 34))
+
+    # Coins are opaque, so a colorkey is enough and keeps blits on the fast path
+    COIN_SURF = pygame.Surface((COIN_RADIUS * 2, COIN_RADIUS * 2)).convert()
+    COIN_SURF.fill((255, 0, 255))
+    pygame.draw.circle(COIN_SURF, (255, 215, 0), (COIN_RADIUS, COIN_RADIUS), COIN_RADIUS)
+    pygame.draw.circle(COIN_SURF, (255, 255, 255), (COIN_RADIUS - 3, COIN_RADIUS - 3), 3)
+    COIN_SURF.set_colorkey((255, 0, 255), pygame.RLEACCEL)
+
+    # One particle sprite per remaining lifetime, fading out as it expires
+    PARTICLE_SURFS = []
+    for i in range(PARTICLE_LIFETIME + 1):
+        surf = pygame.Surface((4, 4), pygame.SRCALPHA)
+        pygame.draw.circle(surf, (255, 215, 0, int(255 * i / PARTICLE_LIFETIME)), (2, 2), 2)
+        PARTICLE_SURFS.append(surf.convert_alpha())
+
 # -------------------------
 # Game classes
 # -------------------------
 class Bird:
+    __slots__ = ('x', 'y', 'w', 'h', 'vel', 'rect', 'rotation')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -77,7 +115,6 @@ class Bird:
         self.vel = 0.0
         self.rect = pygame.Rect(self.x, self.y, self.w, self.h)
         self.rotation = 0
-        self.image = load_image('bird.png', (255, 210, 0), (self.w, self.h))  # Yellow fallback
 
     def flap(self):
         self.vel = FLAP_STRENGTH
@@ -88,37 +125,34 @@ class Bird:
         self.vel += GRAVITY
         self.y += self.vel
         self.rotation = max(-25, min(90, -self.vel * 3))
-        self.rect.topleft = (self.x, self.y)
+        self.rect.topleft = (int(self.x), int(self.y))
 
     def draw(self, surf):
-        rotated_image = pygame.transform.rotate(self.image, self.rotation)
+        rotated_image = BIRD_IMAGES[round(self.rotation) + 25]
         rect = rotated_image.get_rect(center=(self.x + self.w // 2, self.y + self.h // 2))
-        surf.blit(rotated_image, rect)
+        return surf.blit(rotated_image, rect)
 
 class Pipe:
+    __slots__ = ('x', 'w', 'gap_y', 'passed', 'top', 'bot')
+
     def __init__(self, x):
         self.x = x
         self.w = PIPE_WIDTH
-        self.gap_y = random.randint(int(HEIGHT * 0.2), int(HEIGHT - FLOOR_HEIGHT - PIPE_GAP - 20))
+        self.gap_y = _randint(int(HEIGHT * 0.2), int(HEIGHT - FLOOR_HEIGHT - PIPE_GAP - 20))
         self.passed = False
+        self.top = pygame.Rect(self.x, 0, self.w, self.gap_y)
+        self.bot = pygame.Rect(self.x, self.gap_y + PIPE_GAP, self.w, HEIGHT - FLOOR_HEIGHT - (self.gap_y + PIPE_GAP))
 
     def update(self, speed):
         self.x -= speed
+        self.top.x = self.bot.x = self.x
 
     def offscreen(self):
         return self.x + self.w < 0
 
-    def top_rect(self):
-        return pygame.Rect(self.x, 0, self.w, self.gap_y)
-
-    def bottom_rect(self):
-        return pygame.Rect(self.x, self.gap_y + PIPE_GAP, self.w, HEIGHT - FLOOR_HEIGHT - (self.gap_y + PIPE_GAP))
-
-    def draw(self, surf):
-        pygame.draw.rect(surf, (34, 139, 34), self.top_rect())
-        pygame.draw.rect(surf, (34, 139, 34), self.bottom_rect())
-
 class Coin:
+    __slots__ = ('x', 'y', 'radius', 'rect')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -127,40 +161,45 @@ class Coin:
 
     def update(self, speed):
         self.x -= speed
-        self.rect.center = (self.x, self.y)
+        self.rect.centerx = self.x
 
     def offscreen(self):
         return self.x + self.radius < 0
 
-    def draw(self, surf):
-        pygame.draw.circle(surf, (255, 215, 0), (int(self.x), int(self.y)), self.radius)
-        pygame.draw.circle(surf, (255, 255, 255), (int(self.x - 3), int(self.y - 3)), 3)
-
 class Particle:
+    __slots__ = ('x', 'y', 'lifetime')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
         self.lifetime = PARTICLE_LIFETIME
-        self.color = (255, 215, 0)  # Gold
 
     def update(self):
         self.lifetime -= 1
         self.y -= 1  # Rise up
 
-    def draw(self, surf):
-        if self.lifetime > 0:
-            alpha = int(255 * (self.lifetime / PARTICLE_LIFETIME))
-            color = (self.color[0], self.color[1], self.color[2], alpha)
-            pygame.draw.circle(surf, color, (int(self.x), int(self.y)), 2)
-
 # -------------------------
 # Main Game Functions
 # -------------------------
-def draw_text_center(surf, text, size, y, color=(255,255,255)):
-    font = pygame.font.SysFont(FONT_NAME, size)
-    txt = font.render(text, True, color)
+_FONT_CACHE = {}  # size -> Font
+_TEXT_CACHE = {}  # (text, size, color) -> rendered Surface
+
+def get_font(size):
+    font = _FONT_CACHE.get(size)
+    if font is None:
+        font = _FONT_CACHE[size] = pygame.font.SysFont(FONT_NAME, size)
+    return font
+
+def draw_text_center(surf, text, size, y, color=(255,255,255), cache=True):
+    # Formatted text should pass cache=False, or every distinct value stays cached
+    key = (text, size, color)
+    txt = _TEXT_CACHE.get(key) if cache else None
+    if txt is None:
+        txt = get_font(size).render(text, True, color)
+        if cache:
+            _TEXT_CACHE[key] = txt
     rect = txt.get_rect(center=(WIDTH//2, y))
-    surf.blit(txt, rect)
+    return surf.blit(txt, rect)
 
 def main():
     pygame.init()
@@ -169,54 +208,98 @@ def main():
     clock = pygame.time.Clock()
     pygame.display.set_caption("Flappy (Pygame) — Pro Version")
 
+    # Mouse motion is high-rate and unused, so keep it off the event queue;
+    # window events stay allowed so exposure can force a full redraw
+    pygame.event.set_blocked(pygame.MOUSEMOTION)
+
     # Load assets
     global jump_sound, score_sound, hit_sound, coin_sound
     jump_sound = load_sound('jump.wav')
     score_sound = load_sound('score.wav')
     hit_sound = load_sound('hit.wav')
     coin_sound = load_sound('coin.wav')
-    bg_image = load_image('background.png', (135, 206, 235), (WIDTH, HEIGHT))  # Sky blue fallback
+    bg_image = load_image('background.png', (135, 206, 235), (WIDTH, HEIGHT), alpha=False)  # Sky blue fallback
+    build_sprites()
 
     # Colors
     GROUND_COLOR = (222, 184, 135)
 
+    # The sun and ground never change, so composite them into the background
+    # once and draw the whole static scene with a single blit
+    pygame.draw.circle(bg_image, (255, 255, 0), (WIDTH - 60, 60), 28)  # Sun
+    pygame.draw.rect(bg_image, GROUND_COLOR, (0, HEIGHT - FLOOR_HEIGHT, WIDTH, FLOOR_HEIGHT))
+
     highscore = load_highscore()
 
     # Game states: 'menu', 'playing', 'gameover', 'paused'
     state = 'menu'
     score = 0
+    pipe_speed = PIPE_SPEED_BASE  # difficulty scaling, updated when score changes
     paused = False
 
     # Particles for effects
-    particles = []
+    particles = deque()
 
     def reset_game():
-        nonlocal bird, pipes, coins, particles, score, state, paused
+        nonlocal bird, pipes, coins, particles, score, pipe_speed, state, paused
         bird = Bird(BIRD_X, HEIGHT//2 - BIRD_HEIGHT//2)
-        pipes = []
-        coins = []
-        particles = []
+        pipes = deque()
+        coins = deque()
+        particles = deque()
         for i in range(2):
             pipes.append(Pipe(WIDTH + i * PIPE_SPACING + 200))
         score = 0
+        pipe_speed = PIPE_SPEED_BASE
         state = 'playing'
         paused = False
 
     bird = Bird(BIRD_X, HEIGHT//2 - BIRD_HEIGHT//2)
-    pipes = [Pipe(WIDTH + 150), Pipe(WIDTH + 150 + PIPE_SPACING)]
-    coins = []
-    particles = []
+    pipes = deque([Pipe(WIDTH + 150), Pipe(WIDTH + 150 + PIPE_SPACING)])
+    coins = deque()
+    particles = deque()
     running = True
 
     just_started_cooldown = 0
+    physics_acc = 0.0  # seconds of game time not yet simulated
+
+    # Screen areas drawn last frame, for dirty-rect display updates
+    prev_dirty = []
+    prev_view = None
+
+    # Rendered score text, rebuilt only when the score changes
+    score_surf = None
+    score_surf_value = None
+
+    # Bind globals and methods used every frame to locals (LOAD_FAST instead
+    # of dict lookups in the frame loop)
+    fps, height, center_x = FPS, HEIGHT, WIDTH // 2
+    step, step_snap, max_acc = PHYSICS_STEP, PHYSICS_SNAP, MAX_PHYSICS_STEPS * PHYSICS_STEP
+    pipe_gap, speed_base, coin_bonus = PIPE_GAP, PIPE_SPEED_BASE, COIN_BONUS
+    floor_y = HEIGHT - FLOOR_HEIGHT
+    spawn_x = WIDTH - PIPE_SPACING  # next pipe spawns once the last one passes this
+    new_x = WIDTH + 20  # where new pipes and coins appear
+    new_pipe, new_coin, new_particle = Pipe, Coin, Particle
+    rand, randint = _random, _randint
+    QUIT, KEYDOWN, MOUSEBUTTONDOWN = pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN
+    K_SPACE, K_UP, K_p, K_ESCAPE = pygame.K_SPACE, pygame.K_UP, pygame.K_p, pygame.K_ESCAPE
+    pipe_surf, coin_surf, particle_surfs = PIPE_SURF, COIN_SURF, PARTICLE_SURFS
+    tick = clock.tick
+    event_get = pygame.event.get
+    blit = screen.blit
+    blits = screen.blits
+    display_update = pygame.display.update
+    display_flip = pygame.display.flip
+    expose_events = (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.VIDEOEXPOSE)
 
     while running:
-        dt = clock.tick(FPS) / 1000.0
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        dt = tick(fps) / 1000.0
+        for event in event_get():
+            if event.type == QUIT:
                 running = False
-            if event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_SPACE, pygame.K_UP):
+            if event.type in expose_events:
+                prev_view = None  # window contents were lost; force a full flip
+            if event.type == KEYDOWN:
+                if event.key in (K_SPACE, K_UP):
                     if state == 'menu':
                         reset_game()
                         just_started_cooldown = 10
@@ -225,11 +308,11 @@ def main():
                     elif state == 'gameover':
                         reset_game()
                         just_started_cooldown = 10
-                if event.key == pygame.K_p and state == 'playing':
+                if event.key == K_p and state == 'playing':
                     paused = not paused
-                if event.key == pygame.K_ESCAPE:
+                if event.key == K_ESCAPE:
                     running = False
-            if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.type == MOUSEBUTTONDOWN:
                 if event.button == 1:
                     if state == 'menu':
                         reset_game()
@@ -240,110 +323,134 @@ def main():
                         reset_game()
                         just_started_cooldown = 10
 
-        # Update
+        # Update: physics advances in fixed steps so slow frames don't slow the
+        # game down; a long stall is capped to avoid a catch-up burst. Rendering
+        # is capped at the physics rate and not interpolated, so clock.tick's
+        # millisecond jitter is snapped away; otherwise the accumulator would
+        # periodically run zero steps and repeat a frame.
         if state == 'playing' and not paused:
-            if just_started_cooldown > 0:
-                just_started_cooldown -= 1
-            bird.update()
-
-            # Difficulty scaling
-            pipe_speed = PIPE_SPEED_BASE + score // 10
-
-            # Spawn pipes
-            if len(pipes) == 0 or (pipes[-1].x < WIDTH - PIPE_SPACING):
-                pipes.append(Pipe(WIDTH + 20))
-                # Spawn coin per pipe
-                if random.random() < 0.5:
-                    coin_y = random.randint(pipes[-1].gap_y + 20, pipes[-1].gap_y + PIPE_GAP - 20)
-                    coins.append(Coin(WIDTH + 20, coin_y))
-
-            # Update pipes
-            for p in pipes:
-                p.update(pipe_speed)
-            pipes = [p for p in pipes if not p.offscreen()]
-
-            # Update coins
-            for c in coins:
-                c.update(pipe_speed)
-            coins = [c for c in coins if not c.offscreen()]
-
-            # Update particles
-            for p in particles:
-                p.update()
-            particles = [p for p in particles if p.lifetime > 0]
-
-            # Collisions: bird with pipes
-            bird_rect = pygame.Rect(int(bird.x), int(bird.y), bird.w, bird.h)
-            hit = False
-            for p in pipes:
-                if bird_rect.colliderect(p.top_rect()) or bird_rect.colliderect(p.bottom_rect()):
+            if abs(dt - step) < step_snap:
+                dt = step
+            physics_acc = min(physics_acc + dt, max_acc)
+            while physics_acc >= step and state == 'playing':
+                physics_acc -= step
+                if just_started_cooldown > 0:
+                    just_started_cooldown -= 1
+                bird.update()
+
+                # Spawn pipes
+                if len(pipes) == 0 or (pipes[-1].x < spawn_x):
+                    pipes.append(new_pipe(new_x))
+                    # Spawn coin per pipe
+                    if rand() < 0.5:
+                        coin_y = randint(pipes[-1].gap_y + 20, pipes[-1].gap_y + pipe_gap - 20)
+                        coins.append(new_coin(new_x, coin_y))
+
+                # Pipes, coins and particles are appended in spawn order and all
+                # advance at the same rate, so expired ones are always at the front
+                # Update pipes
+                for p in pipes:
+                    p.update(pipe_speed)
+                while pipes and pipes[0].offscreen():
+                    pipes.popleft()
+
+                # Update coins
+                for c in coins:
+                    c.update(pipe_speed)
+                while coins and coins[0].offscreen():
+                    coins.popleft()
+
+                # Update particles
+                for p in particles:
+                    p.update()
+                while particles and particles[0].lifetime <= 0:
+                    particles.popleft()
+
+                # Collisions: bird with pipes
+                hit = False
+                for p in pipes:
+                    # Only a pipe overlapping the bird horizontally can hit it
+                    if p.x < bird.rect.right and p.x + p.w > bird.rect.left:
+                        if bird.rect.colliderect(p.top) or bird.rect.colliderect(p.bot):
+                            hit = True
+                    if not p.passed and p.x + p.w < bird.x:
+                        p.passed = True
+                        score += 1
+                        pipe_speed = speed_base + score // 10
+                        if score_sound:
+                            score_sound.play()
+
+                # Collisions: bird with coins; walk backwards so deleting by index
+                # needs no copy, and spawn order is kept for front culling
+                for i in range(len(coins) - 1, -1, -1):
+                    c = coins[i]
+                    if bird.rect.colliderect(c.rect):
+                        score += coin_bonus
+                        pipe_speed = speed_base + score // 10
+                        del coins[i]
+                        particles.extend([new_particle(c.x, c.y) for _ in range(5)])  # Spark effect
+                        if coin_sound:
+                            coin_sound.play()
+
+                # Collisions: floor/ceiling
+                if bird.y + bird.h >= floor_y or bird.y <= 0:
                     hit = True
-                if not p.passed and p.x + p.w < bird.x:
-                    p.passed = True
-                    score += 1
-                    if score_sound:
-                        score_sound.play()
-
-            # Collisions: bird with coins
-            for c in coins[:]:
-                if bird_rect.colliderect(c.rect):
-                    score += COIN_BONUS
-                    coins.remove(c)
-                    particles.extend([Particle(c.x, c.y) for _ in range(5)])  # Spark effect
-                    if coin_sound:
-                        coin_sound.play()
-
-            # Collisions: floor/ceiling
-            if bird.y + bird.h >= HEIGHT - FLOOR_HEIGHT or bird.y <= 0:
-                hit = True
-
-            if hit:
-                state = 'gameover'
-                if hit_sound:
-                    hit_sound.play()
-                if score > highscore:
-                    highscore = score
-                    save_highscore(highscore)
+
+                if hit:
+                    state = 'gameover'
+                    if hit_sound:
+                        hit_sound.play()
+                    if score > highscore:
+                        highscore = score
+                        save_highscore(highscore)
+        else:
+            physics_acc = 0.0
 
         # Draw
-        screen.blit(bg_image, (0, 0))  # Background
-        pygame.draw.circle(screen, (255, 255, 0), (WIDTH - 60, 60), 28)  # Sun
+        blit(bg_image, (0, 0))  # Background, sun and ground
 
-        # Draw pipes
+        # Draw pipes, coins and particles as a single batched blit
+        blit_list = []
         for p in pipes:
-            p.draw(screen)
-
-        # Draw coins
+            blit_list.append((pipe_surf, p.top, (0, 0, p.w, p.top.h)))
+            blit_list.append((pipe_surf, p.bot, (0, 0, p.w, p.bot.h)))
         for c in coins:
-            c.draw(screen)
-
-        # Draw particles
+            blit_list.append((coin_surf, (int(c.x) - c.radius, int(c.y) - c.radius)))
         for p in particles:
-            p.draw(screen)
-
-        # Draw ground
-        pygame.draw.rect(screen, GROUND_COLOR, (0, HEIGHT - FLOOR_HEIGHT, WIDTH, FLOOR_HEIGHT))
+            blit_list.append((particle_surfs[p.lifetime], (int(p.x) - 2, int(p.y) - 2)))
+        dirty = blits(blit_list)
 
         # Draw bird
-        bird.draw(screen)
+        dirty.append(bird.draw(screen))
 
         # HUD
         if state == 'menu':
-            draw_text_center(screen, "Flappy (Pygame) - Pro", 36, HEIGHT//3)
-            draw_text_center(screen, "Press SPACE or Click to start", 20, HEIGHT//2)
-            draw_text_center(screen, f"High score: {highscore}", 20, HEIGHT//2 + 40)
-            draw_text_center(screen, "P to pause, ESC to quit", 14, HEIGHT - 20, color=(50,50,50))
+            draw_text_center(screen, "Flappy (Pygame) - Pro", 36, height//3)
+            draw_text_center(screen, "Press SPACE or Click to start", 20, height//2)
+            draw_text_center(screen, f"High score: {highscore}", 20, height//2 + 40, cache=False)
+            draw_text_center(screen, "P to pause, ESC to quit", 14, height - 20, color=(50,50,50))
         elif state == 'playing':
-            draw_text_center(screen, str(score), 48, 60)
+            if score != score_surf_value:
+                score_surf = get_font(48).render(str(score), True, (255, 255, 255))
+                score_surf_value = score
+            dirty.append(blit(score_surf, score_surf.get_rect(center=(center_x, 60))))
             if paused:
-                draw_text_center(screen, "Paused - Press P to resume", 24, HEIGHT//2, color=(255,0,0))
+                draw_text_center(screen, "Paused - Press P to resume", 24, height//2, color=(255,0,0))
         elif state == 'gameover':
-            draw_text_center(screen, "Game Over", 42, HEIGHT//3)
-            draw_text_center(screen, f"Score: {score}", 28, HEIGHT//2)
-            draw_text_center(screen, f"High Score: {highscore}", 22, HEIGHT//2 + 40)
-            draw_text_center(screen, "Press SPACE or Click to restart", 18, HEIGHT//2 + 100)
-
-        pygame.display.flip()
+            draw_text_center(screen, "Game Over", 42, height//3)
+            draw_text_center(screen, f"Score: {score}", 28, height//2, cache=False)
+            draw_text_center(screen, f"High Score: {highscore}", 22, height//2 + 40, cache=False)
+            draw_text_center(screen, "Press SPACE or Click to restart", 18, height//2 + 100)
+
+        # While playing only the sprites and score change between frames, so
+        # upload just their old and new areas; menus and state changes flip
+        view = (state, paused)
+        if state == 'playing' and view == prev_view:
+            display_update(prev_dirty + dirty)
+        else:
+            display_flip()
+        prev_view = view
+        prev_dirty = dirty
 
     pygame.quit()
     sys.exit()